@@ -6,15 +6,91 @@ Replaces filesystem JSON and CSV storage with a single SQLite database.
 
 import json
 import sqlite3
+import threading
 import time
+from collections import OrderedDict
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None  # type: ignore
+
 
 # Database configuration
 DATABASE_PATH = Path("scam_app.db")
 
+# Read caches for history summaries (keyed by limit/offset), aggregate metrics
+# and per-call detail. Entries are tagged with the database's data_version as
+# seen by a dedicated probe connection, which changes whenever any other
+# connection (another thread or another process, WAL or not) commits; writes
+# from this process also clear the caches directly.
+_CACHE_LOCK = threading.Lock()
+_CACHE_GEN = 0  # bumped on every local write; results read across a write are not stored
+# Summary pages keyed by the client's (limit, offset), most recently used last.
+_SUMMARIES_CACHE: "OrderedDict[Tuple[int, int], Tuple[int, List[Dict[str, Any]]]]" = OrderedDict()
+_SUMMARIES_CACHE_MAX = 16
+_METRICS_CACHE: Optional[Tuple[int, Dict[str, Any]]] = None
+# Decoded per-call detail (meta + transcript), most recently used last.
+_DETAIL_CACHE: "OrderedDict[str, Tuple[int, Dict[str, Any]]]" = OrderedDict()
+_DETAIL_CACHE_MAX = 128
+
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize with orjson when available (UTF-8, like ensure_ascii=False)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _json_loads(data: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+_PROBE_LOCK = threading.Lock()
+_PROBE_CONN: Optional[sqlite3.Connection] = None
+_PROBE_PATH: Optional[str] = None
+
+
+def _db_signature() -> Optional[int]:
+    """Return PRAGMA data_version from the probe connection, or None if unavailable."""
+    global _PROBE_CONN, _PROBE_PATH
+    path = str(DATABASE_PATH)
+    with _PROBE_LOCK:
+        try:
+            if _PROBE_CONN is None or _PROBE_PATH != path:
+                if _PROBE_CONN is not None:
+                    _PROBE_CONN.close()
+                _PROBE_CONN = None
+                if not DATABASE_PATH.exists():
+                    return None
+                _PROBE_CONN = sqlite3.connect(path, check_same_thread=False)
+                _PROBE_PATH = path
+            return _PROBE_CONN.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error:
+            return None
+
+
+def _invalidate_read_caches() -> None:
+    global _CACHE_GEN, _METRICS_CACHE
+    with _CACHE_LOCK:
+        _CACHE_GEN += 1
+        _SUMMARIES_CACHE.clear()
+        _METRICS_CACHE = None
+        _DETAIL_CACHE.clear()
+
+
+def _detail_copy(detail: Dict[str, Any]) -> Dict[str, Any]:
+    # Callers may edit the top-level containers; transcript entries are shared.
+    return {"sid": detail["sid"], "meta": dict(detail["meta"]), "transcript": list(detail["transcript"])}
+
 
 def init_database() -> None:
     """Initialize the SQLite database with required tables."""
@@ -45,19 +121,34 @@ def init_database() -> None:
         """)
 
 
+# One connection per thread, opened on first use and reused afterwards, so the
+# persistence worker and other long-lived threads skip a connect per write.
+_THREAD_CONN = threading.local()
+
+
+def _thread_connection() -> sqlite3.Connection:
+    path = str(DATABASE_PATH)
+    conn = getattr(_THREAD_CONN, "conn", None)
+    if conn is None or getattr(_THREAD_CONN, "path", None) != path:
+        if conn is not None:
+            conn.close()
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row  # Enable dict-like access
+        _THREAD_CONN.conn = conn
+        _THREAD_CONN.path = path
+    return conn
+
+
 @contextmanager
 def get_db_connection():
-    """Context manager for database connections with proper cleanup."""
-    conn = sqlite3.connect(str(DATABASE_PATH))
-    conn.row_factory = sqlite3.Row  # Enable dict-like access
+    """Context manager yielding this thread's connection; commits on success, rolls back on error."""
+    conn = _thread_connection()
     try:
         yield conn
         conn.commit()
     except Exception:
         conn.rollback()
         raise
-    finally:
-        conn.close()
 
 
 def persist_call_history_json(sid: str, meta: Dict[str, Any], transcript: List[Dict[str, Any]]) -> None:
@@ -97,13 +188,14 @@ def persist_call_history_json(sid: str, meta: Dict[str, Any], transcript: List[D
             completed_at,
             duration_seconds or 0,
             "",  # outcome not used in twilio_outbound_call.py format
-            json.dumps(transcript, ensure_ascii=False),
+            _json_dumps(transcript),
             to_number,
             from_number,
             int(has_recordings),
-            json.dumps(meta, ensure_ascii=False),
+            _json_dumps(meta),
             time.time()
         ))
+    _invalidate_read_caches()
 
 
 def persist_call_history_csv(call_sid: str, started_at: str, duration_sec: int, 
@@ -139,6 +231,7 @@ def persist_call_history_csv(call_sid: str, started_at: str, duration_sec: int,
             prompt,
             time.time()
         ))
+    _invalidate_read_caches()
 
 
 def load_call_history_json(sid: str) -> Optional[Dict[str, Any]]:
@@ -146,6 +239,27 @@ def load_call_history_json(sid: str) -> Optional[Dict[str, Any]]:
     Load call history in the format expected by twilio_outbound_call.py
     Returns: {"sid": sid, "meta": {...}, "transcript": [...]} or None
     """
+    sig = _db_signature()
+    with _CACHE_LOCK:
+        gen = _CACHE_GEN
+        cached = _DETAIL_CACHE.get(sid)
+        if cached is not None:
+            _DETAIL_CACHE.move_to_end(sid)
+    if sig is not None and cached is not None and cached[0] == sig:
+        return _detail_copy(cached[1])
+
+    detail = _load_call_history_row(sid)
+    if detail is not None and sig is not None:
+        with _CACHE_LOCK:
+            if gen == _CACHE_GEN:
+                _DETAIL_CACHE[sid] = (sig, _detail_copy(detail))
+                _DETAIL_CACHE.move_to_end(sid)
+                while len(_DETAIL_CACHE) > _DETAIL_CACHE_MAX:
+                    _DETAIL_CACHE.popitem(last=False)
+    return detail
+
+
+def _load_call_history_row(sid: str) -> Optional[Dict[str, Any]]:
     with get_db_connection() as conn:
         row = conn.execute(
             "SELECT * FROM call_history WHERE call_sid = ?", (sid,)
@@ -158,7 +272,7 @@ def load_call_history_json(sid: str) -> Optional[Dict[str, Any]]:
         meta = {}
         if row['meta_json']:
             try:
-                meta = json.loads(row['meta_json'])
+                meta = _json_loads(row['meta_json'])
             except Exception:
                 pass
         
@@ -180,7 +294,7 @@ def load_call_history_json(sid: str) -> Optional[Dict[str, Any]]:
         transcript = []
         if row['transcript']:
             try:
-                transcript = json.loads(row['transcript'])
+                transcript = _json_loads(row['transcript'])
             except Exception:
                 pass
         
@@ -217,19 +331,30 @@ def load_history_rows_csv() -> List[Dict[str, str]]:
         return result
 
 
-def scan_history_summaries(limit: int = 200) -> List[Dict[str, Any]]:
+def scan_history_summaries(limit: int = 200, offset: int = 0) -> List[Dict[str, Any]]:
     """
     Load call history summaries in the format expected by twilio_outbound_call.py
     Returns list of dicts with keys: sid, started_at, completed_at, to, from, duration_seconds, has_recordings
+    Rows are newest first; offset skips that many rows for paging.
     """
+    key = (limit, offset)
+    sig = _db_signature()
+    with _CACHE_LOCK:
+        gen = _CACHE_GEN
+        cached = _SUMMARIES_CACHE.get(key)
+        if cached is not None:
+            _SUMMARIES_CACHE.move_to_end(key)
+    if sig is not None and cached is not None and cached[0] == sig:
+        return [dict(item) for item in cached[1]]
+
     with get_db_connection() as conn:
         rows = conn.execute("""
             SELECT call_sid, started_at_epoch, completed_at, to_number, from_number, 
                    duration_sec, has_recordings
             FROM call_history 
             ORDER BY started_at_epoch DESC, created_at DESC
-            LIMIT ?
-        """, (limit,)).fetchall()
+            LIMIT ? OFFSET ?
+        """, (limit, offset)).fetchall()
         
         result = []
         for row in rows:
@@ -242,14 +367,29 @@ def scan_history_summaries(limit: int = 200) -> List[Dict[str, Any]]:
                 'duration_seconds': row['duration_sec'] or 0,
                 'has_recordings': bool(row['has_recordings'])
             })
-        
-        return result
+
+    if sig is not None:
+        with _CACHE_LOCK:
+            if gen == _CACHE_GEN:
+                _SUMMARIES_CACHE[key] = (sig, [dict(item) for item in result])
+                _SUMMARIES_CACHE.move_to_end(key)
+                while len(_SUMMARIES_CACHE) > _SUMMARIES_CACHE_MAX:
+                    _SUMMARIES_CACHE.popitem(last=False)
+    return result
 
 
 def compute_history_metrics() -> Dict[str, Any]:
     """
     Compute history metrics in the format expected by twilio_outbound_call.py
     """
+    global _METRICS_CACHE
+    sig = _db_signature()
+    with _CACHE_LOCK:
+        gen = _CACHE_GEN
+        cached = _METRICS_CACHE
+    if sig is not None and cached is not None and cached[0] == sig:
+        return dict(cached[1])
+
     with get_db_connection() as conn:
         row = conn.execute("""
             SELECT 
@@ -261,12 +401,17 @@ def compute_history_metrics() -> Dict[str, Any]:
         total_calls = row['total_calls'] or 0
         total_duration = row['total_duration_seconds'] or 0
         average_duration = total_duration / total_calls if total_calls > 0 else 0
-        
-        return {
-            "total_calls": total_calls,
-            "total_duration_seconds": total_duration,
-            "average_call_seconds": average_duration
-        }
+
+    metrics = {
+        "total_calls": total_calls,
+        "total_duration_seconds": total_duration,
+        "average_call_seconds": average_duration
+    }
+    if sig is not None:
+        with _CACHE_LOCK:
+            if gen == _CACHE_GEN:
+                _METRICS_CACHE = (sig, dict(metrics))
+    return metrics
 
 
 def migrate_existing_data() -> None:
@@ -311,7 +456,7 @@ def migrate_existing_data() -> None:
         migrated_count = 0
         for json_file in json_dir.glob("*.json"):
             try:
-                data = json.loads(json_file.read_text(encoding='utf-8'))
+                data = _json_loads(json_file.read_bytes())
                 sid = data.get('sid', '')
                 meta = data.get('meta', {})
                 transcript = data.get('transcript', [])
@@ -24,7 +24,7 @@ _DEFAULT_DB = os.getenv("SCAM_APP_DB", os.path.abspath("./scam_app.db"))
 
 # Single connection guarded by a lock. SQLite is fine with this pattern for low QPS.
 _CONN: Optional[sqlite3.Connection] = None
-_LOCK = threading.RLock()
+_LOCK = threading.Lock()
 
 
 def _connect(db_path: str) -> sqlite3.Connection:
@@ -155,7 +155,7 @@ def replace_recordings(call_sid: str, recording_sids: Sequence[str]) -> None:
         )
 
 
-def get_history_summaries(limit: int = 200) -> List[Dict[str, Any]]:
+def get_history_summaries(limit: int = 200, offset: int = 0) -> List[Dict[str, Any]]:
     """
     Return the list of call summaries ordered by started_at DESC, then created_at DESC.
     Output keys match the existing /api/history consumer:
@@ -175,9 +175,9 @@ def get_history_summaries(limit: int = 200) -> List[Dict[str, Any]]:
               EXISTS(SELECT 1 FROM recordings r WHERE r.call_sid = c.call_sid) AS has_recordings
             FROM calls c
             ORDER BY COALESCE(c.started_at, 0) DESC, c.created_at DESC
-            LIMIT ?
+            LIMIT ? OFFSET ?
             """,
-            (int(limit),),
+            (int(limit), int(offset)),
         )
         return [dict(row) for row in cur.fetchall()]
 
@@ -18,7 +18,6 @@ Optional:
 
 from __future__ import annotations
 
-import json
 import os
 import threading
 import time
@@ -26,6 +25,7 @@ from typing import Any, Dict, List, Optional, Tuple
 
 # Import the main app module
 import twilio_outbound_call as appmod  # type: ignore
+from database import _json_dumps
 
 # Initialize DB layer
 from db import sqlite_store
@@ -33,7 +33,7 @@ from db import sqlite_store
 sqlite_store.init(os.getenv("SCAM_APP_DB", os.path.abspath("./scam_app.db")))
 
 # Local lock to serialize persist calls (complements app locks)
-_PERSIST_LOCK = threading.RLock()
+_PERSIST_LOCK = threading.Lock()
 
 
 def _persist_call_history_db(sid: str) -> None:
@@ -44,10 +44,9 @@ def _persist_call_history_db(sid: str) -> None:
         return
 
     # Snapshot in-memory meta and transcript
-    with appmod._CALL_META_LOCK:
-        meta = dict(appmod._CALL_META.get(sid, {}))
-    with appmod._TRANSCRIPTS_LOCK:
-        transcript = list(appmod._TRANSCRIPTS.get(sid, []))
+    meta = appmod._call_meta_snapshot(sid)
+    with appmod._transcript_lock(sid):
+        transcript = appmod._transcript_entries(sid)
 
     # Map meta to calls columns
     to_number = meta.get("to") or meta.get("to_number") or ""
@@ -67,10 +66,10 @@ def _persist_call_history_db(sid: str) -> None:
         except Exception:
             completed_at = None
 
-    # Serialize meta_json for forward compatibility
+    # Serialize meta_json (compact) for forward compatibility
     meta_json = None
     try:
-        meta_json = json.dumps(meta, ensure_ascii=False)
+        meta_json = _json_dumps(meta)
     except Exception:
         meta_json = None
 
@@ -125,11 +124,11 @@ def _load_call_history_db(sid: str) -> Optional[Dict[str, Any]]:
     return sqlite_store.get_call_detail(sid)
 
 
-def _scan_history_summaries_db(limit: int = 200) -> List[Dict[str, Any]]:
+def _scan_history_summaries_db(limit: int = 200, offset: int = 0) -> List[Dict[str, Any]]:
     """
     Replacement for appmod._scan_history_summaries using SQLite.
     """
-    return sqlite_store.get_history_summaries(limit=limit)
+    return sqlite_store.get_history_summaries(limit=limit, offset=offset)
 
 
 def _compute_history_metrics_db() -> Dict[str, Any]:
@@ -49,6 +49,7 @@ from typing import Any, Dict, List, Optional, Set, Tuple
 sys.path.insert(0, str(Path(__file__).parent / "vendor"))
 
 from database import (
+    _json_dumps,
     init_database,
     persist_call_history_csv,
     load_history_rows_csv,
@@ -73,6 +74,7 @@ except ImportError:
 # Essential Flask imports from vendor
 from flask import (
     Flask,
+    Response,
     abort,
     jsonify,
     make_response,
@@ -80,7 +82,6 @@ from flask import (
     render_template,
     render_template_string,
     request,
-    send_file,
     session,
     url_for,
 )
@@ -199,6 +200,8 @@ BOLD = "\033[1m"
 # -------------------------
 
 app = Flask(__name__)
+app.json.sort_keys = False
+app.json.compact = True
 _sock = Sock(app)
 
 SECRET_KEY = env_str("SECRET_KEY")
@@ -468,7 +471,7 @@ def persist_call_history(call_sid: str) -> None:
             started_at=cs.started_at.isoformat(),
             duration_sec=cs.duration_sec or 0,
             outcome=cs.outcome,
-            transcript=json.dumps(cs.transcript, ensure_ascii=False),
+            transcript=_json_dumps(cs.transcript),
             prompt=cs.prompt_used
         )
 
@@ -533,14 +536,13 @@ def hot_reload_thread(watch_file: Path):
     observer.schedule(handler, str(watch_file.parent), recursive=False)
     observer.start()
     try:
-        while True:
-            if RESTART_EVENT.is_set():
-                time.sleep(0.5)
-                # Exec self to reload
-                print(color("Restarting now...", YELLOW))
-                python = sys.executable
-                os.execv(python, [python] + sys.argv)
-            time.sleep(0.25)
+        # Sleep until the file watcher or /admin/restart sets the event.
+        RESTART_EVENT.wait()
+        time.sleep(0.5)
+        # Exec self to reload
+        print(color("Restarting now...", YELLOW))
+        python = sys.executable
+        os.execv(python, [python] + sys.argv)
     finally:
         observer.stop()
         observer.join()
@@ -937,16 +939,25 @@ def export_csv():
     rows = filter_history(rows, request.args)
     headers = ["callSid", "startedAt", "durationSec", "outcome", "transcript", "prompt"]
 
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=headers)
-    writer.writeheader()
-    for r in rows:
-        writer.writerow({k: r.get(k, "") for k in headers})
+    def generate():
+        # Stream row by row; the buffer only ever holds one CSV line.
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=headers)
+        writer.writeheader()
+        for r in rows:
+            writer.writerow({k: r.get(k, "") for k in headers})
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+        if buf.tell():
+            yield buf.getvalue()
 
-    mem = io.BytesIO(output.getvalue().encode("utf-8"))
     ts = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
-    resp = send_file(mem, mimetype="text/csv", as_attachment=True, download_name=f"scamcalls_{ts}.csv")
-    return resp
+    return Response(
+        generate(),
+        mimetype="text/csv",
+        headers={"Content-Disposition": f"attachment; filename=scamcalls_{ts}.csv"},
+    )
 
 @app.route("/api/scamcalls/export.json", methods=["GET"])
 def export_json():
@@ -0,0 +1,62 @@
+"""Admission control around the admin bcrypt check in twilio_outbound_call."""
+
+import os
+import sys
+import threading
+import types
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import twilio_outbound_call as appmod  # noqa: E402
+
+
+class AdminPasswordAdmissionTest(unittest.TestCase):
+    def setUp(self):
+        self.gate = threading.Event()
+        self.entered = threading.Semaphore(0)
+
+        def checkpw(pw, hashed):
+            self.entered.release()
+            self.gate.wait(5)
+            return pw == hashed
+
+        self._saved = (appmod.bcrypt, appmod._AUTH_ADMIT_WAIT_SECONDS)
+        appmod.bcrypt = types.SimpleNamespace(checkpw=checkpw)
+        self.workers = []
+
+    def tearDown(self):
+        self.gate.set()
+        for t in self.workers:
+            t.join(5)
+        appmod.bcrypt, appmod._AUTH_ADMIT_WAIT_SECONDS = self._saved
+        with appmod._ADMIN_VERIFY_LOCK:
+            appmod._ADMIN_VERIFY_CACHE.clear()
+
+    def _saturate(self):
+        # Occupy every bcrypt slot with a bad password blocked inside checkpw.
+        for _ in range(appmod._AUTH_WORKERS):
+            t = threading.Thread(target=appmod._admin_password_ok, args=("bad", "good"))
+            t.start()
+            self.workers.append(t)
+        for _ in range(appmod._AUTH_WORKERS):
+            self.assertTrue(self.entered.acquire(timeout=5))
+
+    def test_saturated_login_is_turned_away_as_busy(self):
+        self._saturate()
+        appmod._AUTH_ADMIT_WAIT_SECONDS = 0.1
+        self.assertIsNone(appmod._admin_password_ok("good", "good"))
+
+    def test_saturated_login_waits_for_a_free_slot(self):
+        self._saturate()
+        appmod._AUTH_ADMIT_WAIT_SECONDS = 5.0
+        threading.Timer(0.2, self.gate.set).start()
+        self.assertIs(appmod._admin_password_ok("good", "good"), True)
+
+    def test_bad_password_is_rejected(self):
+        self.gate.set()
+        self.assertIs(appmod._admin_password_ok("bad", "good"), False)
+
+
+if __name__ == "__main__":
+    unittest.main()
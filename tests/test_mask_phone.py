@@ -0,0 +1,27 @@
+"""_mask_phone keeps only ASCII digits and '+' before showing the last four."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import twilio_outbound_call as appmod  # noqa: E402
+
+
+class MaskPhoneTest(unittest.TestCase):
+    def test_formatted_number(self):
+        self.assertEqual(appmod._mask_phone(" +1 (555) 123-4567 "), "...4567")
+
+    def test_short_and_empty(self):
+        self.assertEqual(appmod._mask_phone("+12"), "...+12")
+        self.assertEqual(appmod._mask_phone(None), "")
+
+    def test_non_ascii_digits_are_dropped(self):
+        # Arabic-Indic and superscript digits are not part of an E.164 number.
+        self.assertEqual(appmod._mask_phone("+1555123٤٥²"), "...5123")
+        self.assertEqual(appmod._mask_phone("١٢٣٤٥"), "...")
+
+
+if __name__ == "__main__":
+    unittest.main()
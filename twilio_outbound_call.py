@@ -20,22 +20,33 @@ from __future__ import annotations
 import atexit
 import asyncio
 import base64
+import bisect
 import csv
+import hashlib
+import itertools
 import json
 import logging
 import os
+import queue
 import random
 import re
+import shutil
 import signal
 import sys
+import tempfile
 import threading
 import time
 import urllib.request
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Set
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
+from xml.sax.saxutils import escape as xml_text_escape
 
 # Add vendor directory to path for dependencies
 sys.path.insert(0, str(Path(__file__).parent / "vendor"))
@@ -50,6 +61,7 @@ from flask import (
     session,
     url_for,
 )
+from flask.json.provider import DefaultJSONProvider
 
 from werkzeug.middleware.proxy_fix import ProxyFix
 
@@ -88,6 +100,12 @@ try:
 except Exception:
     TwilioHttpClient = None  # type: ignore
 
+# Optional: faster JSON for on-disk state and API responses
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None  # type: ignore
+
 # Optional ngrok
 try:
     from pyngrok import ngrok as ngrok_lib  # type: ignore
@@ -129,11 +147,16 @@ if str(os.environ.get("TWILIO_SDK_DEBUG", "false")).strip().lower() in {"1", "tr
         log.warning("Failed to enable Twilio SDK debug logging: %s", _e)
 
 
+# Everything _mask_phone drops: separators, letters, whitespace, and any
+# non-ASCII digit (numbers are E.164, so only 0-9 and '+' are kept).
+_PHONE_NON_DIGITS_RE = re.compile(r"[^0-9+]")
+
+
 def _mask_phone(val: Optional[str]) -> str:
     s = (val or "").strip()
     if not s:
         return ""
-    digits = "".join(ch for ch in s if ch.isdigit() or ch == "+")
+    digits = _PHONE_NON_DIGITS_RE.sub("", s)
     if len(digits) <= 4:
         return f"...{digits}"
     return f"...{digits[-4:]}"
@@ -146,8 +169,11 @@ def _mask_sid(sid: Optional[str]) -> str:
     return f"{s[:4]}...{s[-4:]}"
 
 
+_XML_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&apos;"})
+
+
 def _xml_escape(s: str) -> str:
-    return (s or "").replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;").replace("'", "&apos;")
+    return (s or "").translate(_XML_ESCAPE_TABLE)
 
 
 app = Flask(__name__, static_folder="static", template_folder="templates")
@@ -155,13 +181,52 @@ app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_host=1)  # type: ignore
 app.secret_key = os.environ.get("FLASK_SECRET", os.urandom(32))
 
 
-TRUE_SET = {"1", "true", "yes", "on", "y", "t"}
+class _OrjsonJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that encodes with orjson when it is installed.
+
+    Honors sort_keys and the indent/compact choice made by response();
+    datetimes still go through Flask's default hook (HTTP-date strings), and
+    anything orjson rejects, or any extra json.dumps option, falls back to
+    the stdlib encoder.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is not None and kwargs.keys() <= {"indent", "separators"}:
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            if kwargs.get("indent"):
+                option |= orjson.OPT_INDENT_2
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            try:
+                return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+            except TypeError:
+                pass
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+
+app.json_provider_class = _OrjsonJSONProvider
+app.json = _OrjsonJSONProvider(app)
+# Polled API payloads are read by the dashboard JS, which needs neither
+# sorted keys nor pretty-printing (even with FLASK_DEBUG on).
+app.json.sort_keys = False
+app.json.compact = True
+
+
+TRUE_SET = frozenset({"1", "true", "yes", "on", "y", "t"})
 
 
 def _parse_bool(s: Optional[str], default: bool = False) -> bool:
     if s is None:
         return default
-    return str(s).strip().lower() in TRUE_SET
+    if s in TRUE_SET:
+        return True
+    return s.strip().lower() in TRUE_SET
 
 
 def _parse_int(s: Optional[str], default: int) -> int:
@@ -174,7 +239,7 @@ def _parse_int(s: Optional[str], default: int) -> int:
 def _parse_csv(s: Optional[str]) -> List[str]:
     if not s:
         return []
-    return [p.strip() for p in str(s).split(",") if p.strip()]
+    return [p for p in (x.strip() for x in s.split(",")) if p]
 
 
 def _now_local() -> datetime:
@@ -184,24 +249,41 @@ def _now_local() -> datetime:
         return datetime.now()
 
 
+_DOTENV_RE = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(.*)$")
+
+# Parsed .env pairs keyed by path; an entry is reused while the file's
+# (mtime_ns, size, inode) signature is unchanged.
+_DOTENV_CACHE_LOCK = threading.Lock()
+_DOTENV_CACHE: Dict[str, Tuple[Tuple[int, int, int], List[Tuple[str, str]]]] = {}
+
+
 def _load_dotenv_pairs(path: str) -> List[Tuple[str, str]]:
     pairs: List[Tuple[str, str]] = []
-    p = Path(path)
-    if not p.exists():
-        return pairs
     try:
-        for raw in p.read_text(encoding="utf-8").splitlines():
-            line = raw.strip()
-            if not line or line.startswith("#"):
-                continue
-            m = re.match(r"^([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(.*)$", line)
-            if not m:
-                continue
-            key = m.group(1)
-            val = m.group(2)
-            if len(val) >= 2 and ((val[0] == val[-1] == '"') or (val[0] == val[-1] == "'")):
-                val = val[1:-1]
-            pairs.append((key, val))
+        # One stat serves as both the existence check and the cache signature.
+        st = os.stat(path)
+        sig = (st.st_mtime_ns, st.st_size, st.st_ino)
+        with _DOTENV_CACHE_LOCK:
+            cached = _DOTENV_CACHE.get(path)
+        if cached is not None and cached[0] == sig:
+            return list(cached[1])
+        with open(path, "r", encoding="utf-8") as f:
+            for raw in f:
+                line = raw.strip()
+                if not line or line.startswith("#"):
+                    continue
+                m = _DOTENV_RE.match(line)
+                if not m:
+                    continue
+                key = m.group(1)
+                val = m.group(2)
+                if len(val) >= 2 and ((val[0] == val[-1] == '"') or (val[0] == val[-1] == "'")):
+                    val = val[1:-1]
+                pairs.append((key, val))
+        with _DOTENV_CACHE_LOCK:
+            _DOTENV_CACHE[path] = (sig, list(pairs))
+    except FileNotFoundError:
+        return pairs
     except Exception as e:
         log.error("Failed to read .env pairs: %s", e)
     return pairs
@@ -226,10 +308,13 @@ HISTORY_CSV_PATH = DATA_DIR / "call_history.csv"
 class RuntimeConfig:
     to_number: str = ""
     from_number: str = ""
-    from_numbers: List[str] = field(default_factory=list)
+    from_numbers: Tuple[str, ...] = ()  # frozen at load; readers index it without locking
 
     active_hours_local: str = "09:00-18:00"
     active_days: List[str] = field(default_factory=lambda: ["Mon", "Tue", "Wed", "Thu", "Fri"])
+    # Derived from active_hours_local/active_days in _load_runtime_from_env
+    active_window_minutes: Tuple[int, int] = (9 * 60, 18 * 60)
+    active_day_set: frozenset = frozenset({"Mon", "Tue", "Wed", "Thu", "Fri"})
     min_interval_seconds: int = 120
     max_interval_seconds: int = 420
     hourly_max_attempts: int = 3
@@ -274,45 +359,64 @@ class RuntimeConfig:
 
     twilio_http_timeout_seconds: int = 10  # network call timeout
 
+    twiml_templates: bool = True  # render hot TwiML from string templates instead of VoiceResponse
+
 
 _runtime = RuntimeConfig()
 
 
+_WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+def _parse_active_hours(s: str) -> Tuple[int, int]:
+    """Parse 'HH:MM-HH:MM' into (start, end) minutes since midnight; defaults to 09:00-18:00."""
+    try:
+        start_str, end_str = (s or "09:00-18:00").split("-", 1)
+        sh, sm = [int(x) for x in start_str.split(":")]
+        eh, em = [int(x) for x in end_str.split(":")]
+    except Exception:
+        sh, sm, eh, em = 9, 0, 18, 0
+    return sh * 60 + sm, eh * 60 + em
+
+
+_DAY_NAME_MAP = {
+    "mon": "Mon",
+    "monday": "Mon",
+    "tue": "Tue",
+    "tues": "Tue",
+    "tuesday": "Tue",
+    "wed": "Wed",
+    "weds": "Wed",
+    "wednesday": "Wed",
+    "thu": "Thu",
+    "thur": "Thu",
+    "thurs": "Thu",
+    "thursday": "Thu",
+    "fri": "Fri",
+    "friday": "Fri",
+    "sat": "Sat",
+    "saturday": "Sat",
+    "sun": "Sun",
+    "sunday": "Sun",
+}
+
+
 def _normalize_day_name(s: str) -> Optional[str]:
     if not s:
         return None
-    t = s.strip().lower()
-    mapping = {
-        "mon": "Mon",
-        "monday": "Mon",
-        "tue": "Tue",
-        "tues": "Tue",
-        "tuesday": "Tue",
-        "wed": "Wed",
-        "weds": "Wed",
-        "wednesday": "Wed",
-        "thu": "Thu",
-        "thur": "Thu",
-        "thurs": "Thu",
-        "thursday": "Thu",
-        "fri": "Fri",
-        "friday": "Fri",
-        "sat": "Sat",
-        "saturday": "Sat",
-        "sun": "Sun",
-        "sunday": "Sun",
-    }
-    return mapping.get(t)
+    return _DAY_NAME_MAP.get(s.strip().lower())
 
 
 def _load_runtime_from_env() -> None:
     _runtime.to_number = (os.environ.get("TO_NUMBER") or "").strip()
     _runtime.from_number = (os.environ.get("FROM_NUMBER") or "").strip()
-    _runtime.from_numbers = _parse_csv(os.environ.get("FROM_NUMBERS"))
+    _runtime.from_numbers = tuple(_parse_csv(os.environ.get("FROM_NUMBERS")))
 
     _runtime.active_hours_local = (os.environ.get("ACTIVE_HOURS_LOCAL") or "09:00-18:00").strip()
     days = _parse_csv(os.environ.get("ACTIVE_DAYS") or "Mon,Tue,Wed,Thu,Fri")
     _runtime.active_days = [d for d in ([_normalize_day_name(x) for x in days]) if d]
+    _runtime.active_window_minutes = _parse_active_hours(_runtime.active_hours_local)
+    _runtime.active_day_set = frozenset(_runtime.active_days)
 
     _runtime.min_interval_seconds = max(30, _parse_int(os.environ.get("MIN_INTERVAL_SECONDS"), 120))
     _runtime.max_interval_seconds = max(_runtime.min_interval_seconds, _parse_int(os.environ.get("MAX_INTERVAL_SECONDS"), 420))
@@ -361,6 +465,7 @@ def _load_runtime_from_env() -> None:
     _runtime.flask_debug = _parse_bool(os.environ.get("FLASK_DEBUG"), False)
 
     _runtime.twilio_http_timeout_seconds = max(3, _parse_int(os.environ.get("TWILIO_HTTP_TIMEOUT_SECONDS"), 10))
+    _runtime.twiml_templates = _parse_bool(os.environ.get("TWIML_TEMPLATES"), True)
 
 
 _load_runtime_from_env()
@@ -404,6 +509,7 @@ _EDITABLE_ENV_KEYS = [
     "PUBLIC_BASE_URL",
     "DIRECT_DIAL_ON_TRIGGER",
     "TWILIO_HTTP_TIMEOUT_SECONDS",
+    "TWIML_TEMPLATES",
 ]
 
 _SECRET_ENV_KEYS = {
@@ -420,11 +526,9 @@ def _current_env_editable_pairs() -> List[Tuple[str, str]]:
     for k in _EDITABLE_ENV_KEYS:
         effective[k] = (os.environ.get(k) or "").strip()
     try:
-        env_path = Path(".env")
-        if env_path.exists():
-            for k, v in _load_dotenv_pairs(str(env_path)):
-                if k in _EDITABLE_ENV_KEYS:
-                    effective[k] = (v or "").strip()
+        for k, v in _load_dotenv_pairs(".env"):
+            if k in _EDITABLE_ENV_KEYS:
+                effective[k] = (v or "").strip()
     except Exception:
         pass
     return [(k, effective.get(k, "")) for k in _EDITABLE_ENV_KEYS]
@@ -441,6 +545,22 @@ def _load_dotenv_for_write() -> List[str]:
         return []
 
 
+def _fsync_dir(path: Path) -> None:
+    """Make a rename inside `path` durable (POSIX only; a no-op elsewhere)."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    try:
+        fd = os.open(str(path), os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
 def _write_env_updates_preserving_comments(updates: Dict[str, str]) -> None:
     env_path = Path(".env")
     try:
@@ -469,21 +589,17 @@ def _write_env_updates_preserving_comments(updates: Dict[str, str]) -> None:
                     content[-1] = content[-1] + "\n"
                 content.append(new_line)
         tmp = env_path.with_suffix(".tmp")
-        bak = env_path.with_suffix(".bak")
         with open(tmp, "w", encoding="utf-8") as f:
             f.writelines(content)
             f.flush()
-        try:
-            if env_path.exists():
-                if bak.exists():
-                    try:
-                        bak.unlink()
-                    except Exception:
-                        pass
-                env_path.replace(bak)
-        except Exception:
-            pass
+            os.fsync(f.fileno())
+        if _parse_bool(os.environ.get("ENV_WRITE_BACKUP"), False) and env_path.exists():
+            try:
+                shutil.copy2(env_path, env_path.with_suffix(".bak"))
+            except Exception as e:
+                log.warning("Failed to back up .env: %s", e)
         os.replace(tmp, env_path)
+        _fsync_dir(env_path.resolve().parent)
         log.info("Wrote .env updates for keys: %s", ", ".join(sorted(updates.keys())))
     except Exception as e:
         log.error("Failed writing .env: %s", e)
@@ -496,6 +612,7 @@ def _apply_env_updates(updates: Dict[str, str]) -> None:
         if k in _EDITABLE_ENV_KEYS and k not in _SECRET_ENV_KEYS:
             os.environ[k] = "" if v is None else str(v)
     _load_runtime_from_env()
+    _composed_prompt.cache_clear()
     _log_runtime_summary(context="after env update")
 
 
@@ -530,63 +647,104 @@ def _reload_runtime_after_env_update() -> None:
         log.debug("Runtime settings reloaded, no changes detected")
 
 
-# Attempt pacing
-_attempts_lock = threading.Lock()
-_dest_attempts: Dict[str, List[float]] = {}
+# Attempt pacing. Each destination's history is only touched under its own
+# lock shard, so pacing checks for different numbers never contend.
+_ATTEMPT_LOCK_SHARDS = 16
+_ATTEMPT_LOCKS = tuple(threading.Lock() for _ in range(_ATTEMPT_LOCK_SHARDS))
+_dest_attempts: Dict[str, "deque[float]"] = {}
 _next_call_epoch_s_lock = threading.Lock()
 _next_call_epoch_s: Optional[int] = None
 _interval_start_epoch_s: Optional[int] = None
 _interval_total_seconds: Optional[int] = None
 
 
-def _prune_attempts(now_ts: int, to_number: str) -> None:
-    with _attempts_lock:
-        lst = _dest_attempts.get(to_number, [])
-        cutoff = now_ts - 24 * 3600
-        _dest_attempts[to_number] = [t for t in lst if t >= cutoff]
+def _attempts_lock(to_number: str) -> threading.Lock:
+    return _ATTEMPT_LOCKS[hash(to_number) % _ATTEMPT_LOCK_SHARDS]
+
+
+def _prune_attempts_locked(now_ts: int, to_number: str) -> None:
+    # Caller holds _attempts_lock(to_number). Attempts are appended in time
+    # order, so expired entries sit at the left.
+    dq = _dest_attempts.get(to_number)
+    if not dq:
+        return
+    cutoff = now_ts - 24 * 3600
+    while dq and dq[0] < cutoff:
+        dq.popleft()
+
+
+def _attempt_counts_locked(now_ts: int, to_number: str) -> Tuple[int, int]:
+    """Return (last hour, last 24h) attempt counts; caller holds _attempts_lock(to_number)."""
+    _prune_attempts_locked(now_ts, to_number)
+    dq = _dest_attempts.get(to_number)
+    if not dq:
+        return 0, 0
+    # After pruning every entry is within the day; the last hour is a suffix.
+    return len(dq) - bisect.bisect_left(dq, now_ts - 3600), len(dq)
 
 
 def _note_attempt(now_ts: float, to_number: str) -> None:
-    with _attempts_lock:
-        _dest_attempts.setdefault(to_number, []).append(now_ts)
+    with _attempts_lock(to_number):
+        _dest_attempts.setdefault(to_number, deque()).append(now_ts)
     log.info("Noted attempt at %s for %s", int(now_ts), _mask_phone(to_number))
 
 
 def _within_active_window(now_local: datetime) -> bool:
-    try:
-        start_str, end_str = (_runtime.active_hours_local or "09:00-18:00").split("-", 1)
-        sh, sm = [int(x) for x in start_str.split(":")]
-        eh, em = [int(x) for x in end_str.split(":")]
-    except Exception:
-        sh, sm, eh, em = 9, 0, 18, 0
-    wd_map = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-    today = wd_map[now_local.weekday()]
-    if _runtime.active_days and today not in _runtime.active_days:
+    if _runtime.active_day_set and _WEEKDAYS[now_local.weekday()] not in _runtime.active_day_set:
         return False
     t_minutes = now_local.hour * 60 + now_local.minute
-    start_m = sh * 60 + sm
-    end_m = eh * 60 + em
+    start_m, end_m = _runtime.active_window_minutes
     if start_m <= end_m:
         return start_m <= t_minutes <= end_m
     return t_minutes >= start_m or t_minutes <= end_m
 
 
-def _can_attempt(now_ts: int, to_number: str) -> Tuple[bool, int]:
-    _prune_attempts(now_ts, to_number)
-    with _attempts_lock:
-        lst = _dest_attempts.get(to_number, [])
-        last_hour = [t for t in lst if t >= now_ts - 3600]
-        if len(last_hour) >= _runtime.hourly_max_attempts:
-            oldest = min(last_hour) if last_hour else now_ts
-            wait = max(1, (int(oldest) + 3600) - now_ts)
-            log.info("Attempt blocked by hourly cap: %s/%s, wait %ss", len(last_hour), _runtime.hourly_max_attempts, wait)
-            return False, wait
-        if len(lst) >= _runtime.daily_max_attempts:
-            log.info("Attempt blocked by daily cap: %s/%s", len(lst), _runtime.daily_max_attempts)
-            return False, 3600
+# The window check only changes on a minute boundary, a config reload or a
+# local timezone change, so the answer is memoised per wall-clock minute and
+# keyed on the window settings and the timezone (TZ and the offsets tzset()
+# publishes), and published as one tuple.
+_ACTIVE_WINDOW_MEMO: Tuple[int, Any, bool] = (-1, None, False)
+
+
+def _within_active_window_now() -> bool:
+    global _ACTIVE_WINDOW_MEMO
+    minute = int(time.time()) // 60
+    cfg = (
+        _runtime.active_window_minutes,
+        _runtime.active_day_set,
+        os.environ.get("TZ"),
+        time.timezone,
+        time.altzone,
+    )
+    memo_minute, memo_cfg, within = _ACTIVE_WINDOW_MEMO
+    if memo_minute == minute and memo_cfg == cfg:
+        return within
+    within = _within_active_window(_now_local())
+    _ACTIVE_WINDOW_MEMO = (minute, cfg, within)
+    return within
+
+
+def _can_attempt_locked(now_ts: int, to_number: str, hourly: int, daily: int) -> Tuple[bool, int]:
+    # Caller holds _attempts_lock(to_number) and passes the counts it read
+    # from _attempt_counts_locked under that same hold.
+    if hourly >= _runtime.hourly_max_attempts:
+        dq = _dest_attempts.get(to_number) or ()
+        oldest = dq[len(dq) - hourly] if hourly else now_ts
+        wait = max(1, (int(oldest) + 3600) - now_ts)
+        log.info("Attempt blocked by hourly cap: %s/%s, wait %ss", hourly, _runtime.hourly_max_attempts, wait)
+        return False, wait
+    if daily >= _runtime.daily_max_attempts:
+        log.info("Attempt blocked by daily cap: %s/%s", daily, _runtime.daily_max_attempts)
+        return False, 3600
     return True, 0
 
 
+def _can_attempt(now_ts: int, to_number: str) -> Tuple[bool, int]:
+    with _attempts_lock(to_number):
+        hourly, daily = _attempt_counts_locked(now_ts, to_number)
+        return _can_attempt_locked(now_ts, to_number, hourly, daily)
+
+
 def _compute_next_interval_seconds() -> int:
     lo = max(30, int(_runtime.min_interval_seconds))
     hi = max(lo, int(_runtime.max_interval_seconds))
@@ -630,24 +788,33 @@ def _ensure_twilio_client() -> Optional[Client]:
     return _twilio_client
 
 
+# Round-robin cursor over FROM_NUMBERS; next() on a count is atomic under the GIL.
+_FROM_NUMBER_SEQ = itertools.count()
+
+
 def _choose_from_number() -> Optional[str]:
-    if _runtime.from_numbers:
-        return random.choice(_runtime.from_numbers)
+    pool = _runtime.from_numbers
+    if pool:
+        return pool[next(_FROM_NUMBER_SEQ) % len(pool)]
     return _runtime.from_number or None
 
 
 # Background dialer and state
 _manual_call_requested = threading.Event()
 _stop_requested = threading.Event()
+# Set whenever the dialer should re-evaluate before its next deadline
+# (manual trigger, schedule change, shutdown).
+_dialer_wake = threading.Event()
+_DIALER_MAX_SLEEP_SECONDS = 30.0  # bound the wait so wall-clock jumps are noticed
 _dialer_thread = None  # started in main()
 
 # Track active and pending (pre-callback) call states
-_CURRENT_CALL_LOCK = threading.Lock()
+# Single reference; rebinding/reading a global is atomic, so no lock is needed.
 _CURRENT_CALL_SID: Optional[str] = None
 
 # Pending is used to block duplicate placements between calls.create and Twilio callbacks
-_PENDING_LOCK = threading.Lock()
-_PENDING_UNTIL_TS: Optional[float] = None
+# Monotonic deadline; a single float rebind is atomic, so no lock is needed.
+_PENDING_UNTIL_MONO: float = 0.0
 _PENDING_TTL_SECONDS = 30.0  # short TTL during diagnostics
 
 # Track last placement error to surface to UI
@@ -670,40 +837,30 @@ def _clear_last_dial_error() -> None:
 
 def _set_current_call_sid(sid: Optional[str]) -> None:
     global _CURRENT_CALL_SID
-    with _CURRENT_CALL_LOCK:
-        _CURRENT_CALL_SID = sid
+    _CURRENT_CALL_SID = sid
     log.info("Set current call SID to %s", _mask_sid(sid))
 
 
 def _get_current_call_sid() -> Optional[str]:
-    with _CURRENT_CALL_LOCK:
-        return _CURRENT_CALL_SID
+    return _CURRENT_CALL_SID
 
 
 def _mark_outgoing_pending() -> None:
-    global _PENDING_UNTIL_TS
-    with _PENDING_LOCK:
-        _PENDING_UNTIL_TS = time.time() + _PENDING_TTL_SECONDS
+    global _PENDING_UNTIL_MONO
+    _PENDING_UNTIL_MONO = time.monotonic() + _PENDING_TTL_SECONDS
     log.info("Marked outgoing call as pending for %.0fs", _PENDING_TTL_SECONDS)
 
 
 def _clear_outgoing_pending() -> None:
-    global _PENDING_UNTIL_TS
-    with _PENDING_LOCK:
-        _PENDING_UNTIL_TS = None
+    global _PENDING_UNTIL_MONO
+    _PENDING_UNTIL_MONO = 0.0
     log.info("Cleared outgoing pending flag.")
 
 
 def _is_outgoing_pending() -> bool:
-    global _PENDING_UNTIL_TS
-    with _PENDING_LOCK:
-        if _PENDING_UNTIL_TS is None:
-            return False
-        if time.time() >= _PENDING_UNTIL_TS:
-            _PENDING_UNTIL_TS = None
-            log.info("Pending flag expired.")
-            return False
-        return True
+    # Expiry is implied by the deadline; the value is never reset here so a
+    # concurrent _mark_outgoing_pending cannot be overwritten.
+    return time.monotonic() < _PENDING_UNTIL_MONO
 
 
 # Dialog rotation and per-call parameters
@@ -723,7 +880,9 @@ _DIALOGS: List[List[str]] = [
     ["Confirm the details.", "Do not omit anything relevant."],
 ]
 
-_CALL_PARAMS_BY_SID: Dict[str, CallParams] = {}
+# Bounded so SIDs whose completion callback never arrives cannot accumulate forever.
+_CALL_PARAMS_MAX_SIDS = 1024
+_CALL_PARAMS_BY_SID: "OrderedDict[str, CallParams]" = OrderedDict()
 _PENDING_CALL_PARAMS: Optional[CallParams] = None
 _PLACED_CALL_COUNT = 0
 _LAST_DIALOG_IDX = -1
@@ -778,6 +937,9 @@ def _assign_params_to_sid(sid: str) -> None:
         if _PENDING_CALL_PARAMS is None:
             _PENDING_CALL_PARAMS = _select_next_call_params_locked()
         _CALL_PARAMS_BY_SID[sid] = _PENDING_CALL_PARAMS
+        _CALL_PARAMS_BY_SID.move_to_end(sid)
+        while len(_CALL_PARAMS_BY_SID) > _CALL_PARAMS_MAX_SIDS:
+            _CALL_PARAMS_BY_SID.popitem(last=False)
         log.info("Assigned params to SID %s: %s", _mask_sid(sid), _PENDING_CALL_PARAMS)
         _PENDING_CALL_PARAMS = None
     finally:
@@ -793,6 +955,7 @@ def _get_params_for_sid(sid: str) -> CallParams:
     try:
         cp = _CALL_PARAMS_BY_SID.get(sid)
         if cp:
+            _CALL_PARAMS_BY_SID.move_to_end(sid)
             return cp
         return CallParams(voice=_runtime.tts_voice or "man", dialog_idx=0)
     finally:
@@ -814,18 +977,20 @@ def _should_record_call() -> bool:
     return True
 
 
+@lru_cache(maxsize=256)
+def _composed_prompt(idx: int, company_name: str, topic: str) -> Tuple[str, ...]:
+    try:
+        text = IV_PROMPTS[idx].format(company_name=company_name, topic=topic)
+    except Exception:
+        text = IV_PROMPTS[idx]
+    parts = [p.strip() for p in text.split("||") if p.strip()]
+    return tuple(parts[:2]) if parts else ("Could you elaborate?", "What details can you provide?")
+
+
 def _compose_followup_prompts(turn_seed: int) -> List[str]:
     if _runtime.rotate_prompts and IV_PROMPTS:
         idx = abs(turn_seed) % len(IV_PROMPTS)
-        try:
-            text = IV_PROMPTS[idx].format(
-                company_name=_runtime.company_name or "",
-                topic=_runtime.topic or "the topic",
-            )
-        except Exception:
-            text = IV_PROMPTS[idx]
-        parts = [p.strip() for p in text.split("||") if p.strip()]
-        return parts[:2] if parts else ["Could you elaborate?", "What details can you provide?"]
+        return list(_composed_prompt(idx, _runtime.company_name or "", _runtime.topic or "the topic"))
     return ["Could you clarify?", "What details can you share?"]
 
 
@@ -959,6 +1124,10 @@ def _place_call_now() -> bool:
 
 def _initialize_schedule_if_needed(now: int) -> None:
     global _next_call_epoch_s, _interval_start_epoch_s, _interval_total_seconds
+    # Unlocked fast path: once scheduled, the value is only ever replaced, never
+    # cleared, so a non-None read means there is nothing to initialize.
+    if _next_call_epoch_s is not None:
+        return
     with _next_call_epoch_s_lock:
         if _next_call_epoch_s is None:
             _interval_total_seconds = _compute_next_interval_seconds()
@@ -987,13 +1156,16 @@ def _reset_schedule_after_completion(now: int) -> None:
             (_next_call_epoch_s - now) if _next_call_epoch_s else None,
             _interval_total_seconds,
         )
+    _dialer_wake.set()
 
 
-def _log_dialer_gates(label: str) -> Dict[str, Any]:
-    now_ts = int(time.time())
+def _log_dialer_gates(label: str, now_ts: Optional[int] = None) -> Dict[str, Any]:
+    # Callers pass the timestamp they already read so one decision uses one clock reading.
+    if now_ts is None:
+        now_ts = int(time.time())
     active_sid = _get_current_call_sid()
     pending = _is_outgoing_pending()
-    within = _within_active_window(_now_local())
+    within = _within_active_window_now()
     ready, reasons = _diagnostics_ready_to_call()
     can_now, wait_s = (True, 0)
     if _runtime.to_number:
@@ -1009,7 +1181,7 @@ def _log_dialer_gates(label: str) -> Dict[str, Any]:
         wait_if_capped=wait_s,
         to=_mask_phone(_runtime.to_number),
         from_single=_mask_phone(_runtime.from_number),
-        from_pool_count=len(_runtime.from_numbers or []),
+        from_pool_count=len(_runtime.from_numbers),
         public_url_set=bool(_runtime.public_base_url),
     )
     log.info("Dialer gates [%s]: %s", label, snapshot)
@@ -1027,7 +1199,7 @@ def _dialer_loop() -> None:
             if _manual_call_requested.is_set():
                 _manual_call_requested.clear()
                 log.info("Manual call request received by dialer.")
-                gates = _log_dialer_gates("manual")
+                gates = _log_dialer_gates("manual", now)
                 if not gates["ready"]:
                     log.error("Manual call suppressed; not ready: %s", gates["reasons"])
                 else:
@@ -1051,7 +1223,7 @@ def _dialer_loop() -> None:
 
             if ready_time:
                 log.info("Schedule window reached. seconds_until_next=%s", seconds_until)
-                gates = _log_dialer_gates("scheduled")
+                gates = _log_dialer_gates("scheduled", now)
                 if not gates["ready"]:
                     log.error("Scheduled attempt suppressed; not ready: %s", gates["reasons"])
                     _reset_schedule_after_completion(now)
@@ -1076,10 +1248,15 @@ def _dialer_loop() -> None:
                         log.info("Scheduled attempt blocked by caps; rescheduling. wait=%s", gates["wait_if_capped"])
                         _reset_schedule_after_completion(now)
 
-            for _ in range(5):
-                if _stop_requested.is_set():
-                    break
-                time.sleep(0.2)
+            # Sleep until the next scheduled attempt or an explicit wake-up.
+            # Clearing after the wait is safe: the loop re-checks every flag.
+            with _next_call_epoch_s_lock:
+                next_at = _next_call_epoch_s
+            timeout = _DIALER_MAX_SLEEP_SECONDS
+            if next_at is not None:
+                timeout = max(0.2, min(timeout, next_at - time.time()))
+            _dialer_wake.wait(timeout)
+            _dialer_wake.clear()
         except Exception as e:
             log.exception("Dialer loop error: %s", e)
             time.sleep(0.5)
@@ -1088,12 +1265,61 @@ def _dialer_loop() -> None:
 
 
 # Transcripts and call metadata
-_TRANSCRIPTS_LOCK = threading.Lock()
-_TRANSCRIPTS: Dict[str, List[Dict[str, Any]]] = {}
+class _Transcript:
+    """
+    One call's transcript stored column-wise (timestamps, roles, texts, final
+    flags) rather than as a dict per utterance. entries() rebuilds the
+    list-of-dicts shape used by persistence and the API.
+    """
+
+    __slots__ = ("t", "role", "text", "final")
+
+    def __init__(self) -> None:
+        self.t = array("d")
+        self.role: List[str] = []
+        self.text: List[str] = []
+        self.final = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def append(self, t: float, role: str, text: str, final: bool) -> None:
+        self.t.append(t)
+        self.role.append(role)
+        self.text.append(text)
+        self.final.append(1 if final else 0)
 
-_CALL_META_LOCK = threading.Lock()
+    def entries(self) -> List[Dict[str, Any]]:
+        return [
+            {"t": t, "role": role, "text": text, "final": bool(final)}
+            for t, role, text, final in zip(self.t, self.role, self.text, self.final)
+        ]
+
+
+def _transcript_entries(sid: str) -> List[Dict[str, Any]]:
+    """Snapshot a call's transcript as a list of entry dicts; caller holds its lock."""
+    tr = _TRANSCRIPTS.get(sid)
+    return tr.entries() if tr is not None else []
+
+
+_TRANSCRIPTS: Dict[str, _Transcript] = {}
 _CALL_META: Dict[str, Dict[str, Any]] = {}
 
+# Per-call state is only ever read or modified one SID at a time, so the locks
+# are sharded by SID and unrelated calls never contend. Transcript and meta
+# shards are separate, so code may hold one of each for the same SID.
+_SID_LOCK_SHARDS = 64
+_TRANSCRIPT_LOCKS = tuple(threading.Lock() for _ in range(_SID_LOCK_SHARDS))
+_CALL_META_LOCKS = tuple(threading.Lock() for _ in range(_SID_LOCK_SHARDS))
+
+
+def _transcript_lock(sid: str) -> threading.Lock:
+    return _TRANSCRIPT_LOCKS[hash(sid) % _SID_LOCK_SHARDS]
+
+
+def _call_meta_lock(sid: str) -> threading.Lock:
+    return _CALL_META_LOCKS[hash(sid) % _SID_LOCK_SHARDS]
+
 HISTORY_DIR = Path("data/history")
 HISTORY_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -1101,46 +1327,54 @@ HISTORY_DIR.mkdir(parents=True, exist_ok=True)
 def _append_transcript(call_sid: str, role: str, text: str, is_final: bool) -> None:
     if not text:
         return
-    entry = {"t": time.time(), "role": role, "text": text, "final": bool(is_final)}
-    with _TRANSCRIPTS_LOCK:
-        _TRANSCRIPTS.setdefault(call_sid, []).append(entry)
+    now = time.time()
+    with _transcript_lock(call_sid):
+        tr = _TRANSCRIPTS.get(call_sid)
+        if tr is None:
+            tr = _TRANSCRIPTS[call_sid] = _Transcript()
+        tr.append(now, role, text, is_final)
     log.debug("Transcript appended (%s): role=%s, final=%s, len(text)=%s", _mask_sid(call_sid), role, is_final, len(text))
 
 
 def _init_call_meta_if_absent(sid: str, **kwargs: Any) -> None:
-    with _CALL_META_LOCK:
-        meta = _CALL_META.get(sid)
-        if meta is None:
-            meta = {}
-            _CALL_META[sid] = meta
+    with _call_meta_lock(sid):
+        meta = _CALL_META.setdefault(sid, {})
         for k, v in kwargs.items():
-            if k not in meta or meta.get(k) in (None, "", 0):
+            # A missing key reads as None, so one lookup covers absent and empty.
+            if meta.get(k) in (None, "", 0):
                 meta[k] = v
     log.debug("Initialized call meta if absent for %s with keys=%s", _mask_sid(sid), list(kwargs.keys()))
 
 
-def _persist_call_history(sid: str) -> None:
-    with _CALL_META_LOCK:
+def _call_meta_snapshot(sid: str) -> Dict[str, Any]:
+    """Copy a call's meta with the recordings map flattened to a list of dicts."""
+    with _call_meta_lock(sid):
         meta = dict(_CALL_META.get(sid, {}))
-    with _TRANSCRIPTS_LOCK:
-        transcript = list(_TRANSCRIPTS.get(sid, []))
+        recs = meta.get("recordings")
+        if isinstance(recs, dict):
+            meta["recordings"] = [dict(r) for r in recs.values()]
+    return meta
+
+
+def _persist_call_history(sid: str) -> None:
+    meta = _call_meta_snapshot(sid)
+    with _transcript_lock(sid):
+        transcript = _transcript_entries(sid)
     if not sid:
         return
-    try:
-        # Use SQLite database instead of JSON files
-        persist_call_history_json(sid, meta, transcript)
-        log.info("Persisted call history for %s (%s entries).", _mask_sid(sid), len(transcript))
-    except Exception as e:
-        log.error("Failed to persist call history: %s", e)
+    # Errors propagate so the persist worker can tell a failed write apart.
+    persist_call_history_json(sid, meta, transcript)
+    log.info("Persisted call history for %s (%s entries).", _mask_sid(sid), len(transcript))
 
 
 def _load_call_history(sid: str) -> Optional[Dict[str, Any]]:
     return load_call_history_json(sid)
 
 
-def _scan_history_summaries(limit: int = 200) -> List[Dict[str, Any]]:
+def _scan_history_summaries(limit: int = 200, offset: int = 0) -> List[Dict[str, Any]]:
     """
-    Collect history items from the SQLite database.
+    Collect history items from the SQLite database, newest first, skipping
+    the first `offset` rows.
 
     Each item is a summary object with keys:
       - sid
@@ -1151,7 +1385,7 @@ def _scan_history_summaries(limit: int = 200) -> List[Dict[str, Any]]:
       - duration_seconds (int)
       - has_recordings (bool)
     """
-    return scan_history_summaries(limit)
+    return scan_history_summaries(limit, offset)
 
 
 def _compute_history_metrics() -> Dict[str, Any]:
@@ -1240,6 +1474,57 @@ def _require_admin_for_api() -> Optional[Response]:
     return None
 
 
+# Successful bcrypt checks are remembered briefly so repeat logins skip the
+# deliberately slow hash. Only successes are cached (a wrong password always
+# pays full bcrypt cost), and keys are keyed-BLAKE2b digests under a
+# per-process secret, never the password itself.
+_ADMIN_VERIFY_TTL_SECONDS = 300.0
+_ADMIN_VERIFY_KEY = os.urandom(32)
+_ADMIN_VERIFY_LOCK = threading.Lock()
+_ADMIN_VERIFY_CACHE: Dict[bytes, float] = {}
+# bcrypt runs on a small dedicated pool. Admission is capped at the worker
+# count: an attempt beyond the cap waits briefly for a slot (one hash takes a
+# fraction of a second, so a real login gets in behind a few bad ones) and is
+# turned away as busy only if none frees up. A slot frees as soon as its hash
+# finishes or is cancelled after a timeout.
+_AUTH_WORKERS = 2
+_AUTH_POOL = ThreadPoolExecutor(max_workers=_AUTH_WORKERS, thread_name_prefix="auth")
+_AUTH_SLOTS = threading.BoundedSemaphore(_AUTH_WORKERS)
+_AUTH_ADMIT_WAIT_SECONDS = 3.0
+_AUTH_TIMEOUT_SECONDS = 5.0
+
+
+def _admin_password_ok(password: str, password_hash: str) -> Optional[bool]:
+    """Check an admin password; returns None when no bcrypt slot frees up in time."""
+    pw = password.encode("utf-8")
+    hashed = password_hash.encode("utf-8")
+    key = hashlib.blake2b(hashed + b"\0" + pw, key=_ADMIN_VERIFY_KEY, digest_size=16).digest()
+    now = time.monotonic()
+    with _ADMIN_VERIFY_LOCK:
+        expires = _ADMIN_VERIFY_CACHE.get(key)
+        if expires is not None:
+            if now < expires:
+                return True
+            del _ADMIN_VERIFY_CACHE[key]
+    if not _AUTH_SLOTS.acquire(timeout=_AUTH_ADMIT_WAIT_SECONDS):
+        return None
+    try:
+        fut = _AUTH_POOL.submit(bcrypt.checkpw, pw, hashed)
+    except Exception:
+        _AUTH_SLOTS.release()
+        return False
+    fut.add_done_callback(lambda _f: _AUTH_SLOTS.release())
+    try:
+        ok = fut.result(timeout=_AUTH_TIMEOUT_SECONDS)
+    except Exception:
+        fut.cancel()
+        ok = False
+    if ok:
+        with _ADMIN_VERIFY_LOCK:
+            _ADMIN_VERIFY_CACHE[key] = now + _ADMIN_VERIFY_TTL_SECONDS
+    return ok
+
+
 @app.route("/admin/login", methods=["GET", "POST"])
 def admin_login():
     if request.method == "GET":
@@ -1250,16 +1535,15 @@ def admin_login():
         return render_template("admin_login.html", error=None)
     username = (request.form.get("username") or "").strip()
     effective_user, effective_hash, uses_hash = _admin_defaults()
-    ok = False
+    ok: Optional[bool] = False
     if uses_hash and effective_hash and bcrypt is not None:
         if username == effective_user:
-            try:
-                ok = bcrypt.checkpw((request.form.get("password") or "").encode("utf-8"), effective_hash.encode("utf-8"))
-            except Exception:
-                ok = False
+            ok = _admin_password_ok(request.form.get("password") or "", effective_hash)
     else:
         ok = (username == effective_user and (request.form.get("password") or "") == "scammers")
     log.info("POST /admin/login: user=%s, success=%s, uses_hash=%s", username, ok, uses_hash)
+    if ok is None:
+        return render_template("admin_login.html", error="Too many sign-in attempts in progress; try again shortly."), 503
     if not ok:
         return render_template("admin_login.html", error="Invalid credentials.")
     session["is_admin"] = True
@@ -1401,15 +1685,18 @@ def api_speech_settings_post():
 
 # Messages rotation (max 10)
 MESSAGES_FILE = DATA_DIR / "messages.json"
+# Published as an immutable tuple: writers swap the reference under the lock,
+# readers take it without locking.
 _USER_MESSAGES_LOCK = threading.Lock()
-_USER_MESSAGES: List[str] = []
+_USER_MESSAGES: Tuple[str, ...] = ()
 
 
 def _load_user_messages_from_disk() -> List[str]:
     if not MESSAGES_FILE.exists():
         return []
     try:
-        raw = json.loads(MESSAGES_FILE.read_text(encoding="utf-8"))
+        data = MESSAGES_FILE.read_bytes()
+        raw = orjson.loads(data) if orjson is not None else json.loads(data)
         if isinstance(raw, dict):
             items = raw.get("messages", [])
         else:
@@ -1425,20 +1712,53 @@ def _load_user_messages_from_disk() -> List[str]:
         return []
 
 
+# The process umask, read once at import (os.umask can only be read by setting
+# it, which is not safe to do later while other threads create files).
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
 def _persist_user_messages_to_disk(msgs: List[str]) -> None:
+    """
+    Write messages.json via a temp file and os.replace so readers never see
+    a half-written file and concurrent saves do not interleave. The temp file
+    takes the existing file's mode (or the umask default for a new file), since
+    NamedTemporaryFile always creates it 0600.
+    """
+    tmp_name = None
     try:
         MESSAGES_FILE.parent.mkdir(parents=True, exist_ok=True)
         payload = {"messages": msgs[:10]}
-        MESSAGES_FILE.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        if orjson is not None:
+            data = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=str(MESSAGES_FILE.parent), prefix=".messages.", suffix=".tmp", delete=False
+        ) as f:
+            tmp_name = f.name
+            f.write(data)
+        try:
+            shutil.copymode(MESSAGES_FILE, tmp_name)
+        except FileNotFoundError:
+            os.chmod(tmp_name, 0o666 & ~_UMASK)
+        os.replace(tmp_name, MESSAGES_FILE)
+        tmp_name = None
         log.info("Persisted %s user messages for rotation.", len(payload["messages"]))
     except Exception as e:
         log.error("Failed to persist user messages: %s", e)
+    finally:
+        if tmp_name:
+            try:
+                os.unlink(tmp_name)
+            except Exception:
+                pass
 
 
 def _init_user_messages() -> None:
     global _USER_MESSAGES
     with _USER_MESSAGES_LOCK:
-        _USER_MESSAGES = _load_user_messages_from_disk()
+        _USER_MESSAGES = tuple(_load_user_messages_from_disk())
     if _USER_MESSAGES:
         log.info("Loaded %s user messages from disk.", len(_USER_MESSAGES))
     else:
@@ -1450,9 +1770,7 @@ _init_user_messages()
 
 @app.route("/api/messages", methods=["GET"])
 def api_messages_get():
-    with _USER_MESSAGES_LOCK:
-        msgs = list(_USER_MESSAGES)
-    return jsonify({"messages": msgs})
+    return jsonify({"messages": list(_USER_MESSAGES)})
 
 
 @app.route("/api/messages", methods=["POST"])
@@ -1476,16 +1794,39 @@ def api_messages_post():
             break
     with _USER_MESSAGES_LOCK:
         global _USER_MESSAGES
-        _USER_MESSAGES = cleaned
+        _USER_MESSAGES = tuple(cleaned)
     _persist_user_messages_to_disk(cleaned)
     return jsonify(ok=True, messages=cleaned)
 
 
 def _pick_user_message() -> Optional[str]:
-    with _USER_MESSAGES_LOCK:
-        if not _USER_MESSAGES:
-            return None
-        return random.choice(_USER_MESSAGES)
+    msgs = _USER_MESSAGES
+    return random.choice(msgs) if msgs else None
+
+
+_SSML_PROSODY_CLOSE = "</prosody></speak>"
+
+
+@lru_cache(maxsize=16)
+def _ssml_prosody_open(rate_percent: int, pitch_semitones: int, volume_db: int) -> str:
+    pitch_sign = "+" if pitch_semitones >= 0 else ""
+    vol_sign = "+" if volume_db >= 0 else ""
+    return (
+        f"<speak><prosody rate='{rate_percent}%' pitch='{pitch_sign}{pitch_semitones}st' "
+        f"volume='{vol_sign}{volume_db}dB'>"
+    )
+
+
+def _prosody_text(text: str, voice: str) -> str:
+    """
+    Return the <Say> body for a line: SSML prosody markup when a Polly voice is
+    selected and any rate/pitch/volume differs from the defaults, else the text.
+    """
+    text = text or ""
+    rate, pitch, volume = _runtime.tts_rate_percent, _runtime.tts_pitch_semitones, _runtime.tts_volume_db
+    if (rate != 100 or pitch != 0 or volume != 0) and voice.startswith("Polly."):  # SSML prosody is supported with Polly voices
+        return _ssml_prosody_open(rate, pitch, volume) + _xml_escape(text) + _SSML_PROSODY_CLOSE
+    return text
 
 
 def _say_with_prosody(vr: VoiceResponse, text: str, voice: str, language: str) -> None:
@@ -1495,37 +1836,67 @@ def _say_with_prosody(vr: VoiceResponse, text: str, voice: str, language: str) -
     """
     text = text or ""
     try:
-        if voice.startswith("Polly.") and (  # SSML prosody is supported with Polly voices
-            _runtime.tts_rate_percent != 100 or _runtime.tts_pitch_semitones != 0 or _runtime.tts_volume_db != 0
-        ):
-            rate = f"{_runtime.tts_rate_percent}%"
-            pitch_sign = "+" if _runtime.tts_pitch_semitones >= 0 else ""
-            pitch = f"{pitch_sign}{_runtime.tts_pitch_semitones}st"
-            vol_sign = "+" if _runtime.tts_volume_db >= 0 else ""
-            volume = f"{vol_sign}{_runtime.tts_volume_db}dB"
-            ssml = f"<speak><prosody rate='{rate}' pitch='{pitch}' volume='{volume}'>{_xml_escape(text)}</prosody></speak>"
-            vr.say(ssml, voice=voice, language=language)
-            return
-        # Fallback to plain <Say>
-        vr.say(text, voice=voice, language=language)
+        vr.say(_prosody_text(text, voice), voice=voice, language=language)
     except Exception as e:
         log.warning("SSML say failed; falling back to plain say: %s", e)
         vr.say(text, voice=voice, language=language)
 
 
+# Precompiled TwiML fragments. Output matches what VoiceResponse serializes
+# (sorted attributes, " />" empty tags) so both paths are interchangeable.
+_TWIML_HEAD = '<?xml version="1.0" encoding="UTF-8"?><Response>'
+_TWIML_TAIL = "</Response>"
+_TWIML_SAY_OPEN_TMPL = '<Say language="{language}" voice="{voice}">'
+_TWIML_SAY_CLOSE = "</Say>"
+_TWIML_PAUSE_TMPL = '<Pause length="{length}" />'
+_TWIML_GATHER_TMPL = (
+    '<Gather action="{action}" bargeIn="{barge_in}" input="speech" language="{language}" method="POST" '
+    'partialResultCallback="{partial}" partialResultCallbackMethod="POST" speechTimeout="auto" timeout="{timeout}" />'
+)
+_TWIML_HANGUP = "<Hangup />"
+_TWIML_STREAM_TMPL = '<Stream track="{track}" url="{url}" />'
+_TWIML_REDIRECT_TMPL = '<Redirect method="POST">{url}</Redirect>'
+
+
+_TWIML_ATTR_ENTITIES = {'"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#09;"}
+
+
+def _twiml_attr(s: str) -> str:
+    return xml_text_escape(s, _TWIML_ATTR_ENTITIES)
+
+
+@lru_cache(maxsize=64)
+def _say_open_twiml(voice: str, language: str) -> str:
+    return _TWIML_SAY_OPEN_TMPL.format(language=_twiml_attr(language), voice=_twiml_attr(voice))
+
+
+def _say_twiml(text: str, voice: str, language: str) -> str:
+    return _say_open_twiml(voice, language) + xml_text_escape(_prosody_text(text, voice)) + _TWIML_SAY_CLOSE
+
+
+def _pause_twiml(seconds: float) -> str:
+    return _TWIML_PAUSE_TMPL.format(length=seconds)
+
+
+def _gather_twiml(action: str, partial: str, barge_in: bool) -> str:
+    return _TWIML_GATHER_TMPL.format(
+        action=_twiml_attr(action),
+        barge_in="true" if barge_in else "false",
+        language=_twiml_attr(_runtime.tts_language),
+        partial=_twiml_attr(partial),
+        timeout=_runtime.callee_silence_hangup_seconds,
+    )
+
+
 def _build_opening_lines_for_sid(call_sid: str) -> List[str]:
-    one = _pop_one_shot_opening()
-    if one:
-        lines = [one]
+    pick = _pick_user_message()
+    if pick:
+        lines = [pick]
     else:
-        pick = _pick_user_message()
-        if pick:
-            lines = [pick]
-        else:
-            params = _get_params_for_sid(call_sid)
-            base_dialog = _get_dialog_lines(params.dialog_idx)
-            first = base_dialog[0] if base_dialog else "Hello."
-            lines = [first]
+        params = _get_params_for_sid(call_sid)
+        base_dialog = _get_dialog_lines(params.dialog_idx)
+        first = base_dialog[0] if base_dialog else "Hello."
+        lines = [first]
     if _runtime.company_name:
         lines.append(f"This is {_runtime.company_name}.")
     if _runtime.topic:
@@ -1534,15 +1905,42 @@ def _build_opening_lines_for_sid(call_sid: str) -> List[str]:
     return [ln for ln in lines if ln]
 
 
+def _callback_base_url() -> str:
+    """
+    Base URL for TwiML action/callback attributes. Uses PUBLIC_BASE_URL (the
+    same base handed to calls.create) and falls back to the request host, so
+    no url_for(_external=True) reversal is needed per webhook.
+    """
+    base = _runtime.public_base_url
+    if base:
+        return base.rstrip("/")
+    return request.host_url.rstrip("/")
+
+
+def _voice_twiml(streams: List[Tuple[str, str]], hello_url: str, base: str) -> str:
+    """
+    Template-based equivalent of the VoiceResponse tree built in voice_entrypoint().
+    """
+    parts = [_TWIML_HEAD]
+    if streams:
+        parts.append("<Start>")
+        for url, track in streams:
+            parts.append(_TWIML_STREAM_TMPL.format(track=_twiml_attr(track), url=_twiml_attr(url)))
+        parts.append("</Start>")
+    parts.append(_gather_twiml(hello_url, f"{base}/transcribe-partial?stage=hello&seq=0", barge_in=False))
+    parts.append(_TWIML_REDIRECT_TMPL.format(url=xml_text_escape(hello_url)))
+    parts.append(_TWIML_TAIL)
+    return "".join(parts)
+
+
 # Twilio voice routes
 @app.route("/voice", methods=["POST", "GET"])
 def voice_entrypoint():
-    if VoiceResponse is None:
+    if VoiceResponse is None and not _runtime.twiml_templates:
         log.error("Server missing Twilio TwiML library.")
         return Response("Server missing Twilio TwiML library.", status=500)
-    vr = VoiceResponse()
 
-    call_sid = request.values.get("CallSid", "") or None
+    call_sid = sys.intern(request.values.get("CallSid", "")) or None
     log.info(
         "ENTRY /voice: CallSid=%s, To=%s, From=%s, Method=%s",
         _mask_sid(call_sid),
@@ -1564,38 +1962,31 @@ def voice_entrypoint():
     # ============================================================================
     # Media Streams setup (for live audio listening feature)
     # ============================================================================
-    if _runtime.enable_media_streams and Start is not None and Stream is not None and _runtime.public_base_url:
-        try:
-            start = Start()
-            ws_base = _runtime.public_base_url.replace("http:", "ws:").replace("https:", "wss:")
-            
-            # Always attach inbound stream (lets you hear the caller)
-            start.stream(url=f"{ws_base}/media-in", track="inbound_track")
-            inbound_attached = True
-            
-            # Only attach outbound stream if explicitly enabled (saves bandwidth)
-            outbound_attached = False
-            if _runtime.stream_outbound_audio:
-                start.stream(url=f"{ws_base}/media-out", track="outbound_track")
-                outbound_attached = True
-            
-            vr.append(start)
-            
-            # Safety logging to make debugging easier
-            log.info(
-                "Attached media streams inbound=%s outbound=%s (CallSid=%s)",
-                inbound_attached,
-                outbound_attached,
-                _mask_sid(call_sid)
-            )
-        except Exception as e:
-            log.warning("Failed to attach media streams: %s", e)
+    streams: List[Tuple[str, str]] = []
+    stream_classes_ok = _runtime.twiml_templates or (Start is not None and Stream is not None)
+    if _runtime.enable_media_streams and stream_classes_ok and _runtime.public_base_url:
+        ws_base = _runtime.public_base_url.replace("http:", "ws:").replace("https:", "wss:")
+
+        # Always attach inbound stream (lets you hear the caller)
+        streams.append((f"{ws_base}/media-in", "inbound_track"))
+
+        # Only attach outbound stream if explicitly enabled (saves bandwidth)
+        if _runtime.stream_outbound_audio:
+            streams.append((f"{ws_base}/media-out", "outbound_track"))
+
+        # Safety logging to make debugging easier
+        log.info(
+            "Attached media streams inbound=%s outbound=%s (CallSid=%s)",
+            True,
+            len(streams) > 1,
+            _mask_sid(call_sid)
+        )
     else:
         # Log why media streams weren't attached (helps troubleshooting)
         reasons = []
         if not _runtime.enable_media_streams:
             reasons.append("ENABLE_MEDIA_STREAMS=false")
-        if Start is None or Stream is None:
+        if not stream_classes_ok:
             reasons.append("TwiML classes unavailable")
         if not _runtime.public_base_url:
             reasons.append("PUBLIC_BASE_URL not set")
@@ -1603,28 +1994,63 @@ def voice_entrypoint():
         if reasons:
             log.debug("Media streams not attached: %s (CallSid=%s)", ", ".join(reasons), _mask_sid(call_sid))
 
+    base = _callback_base_url()
+    hello_url = f"{base}/hello"
+    if _runtime.twiml_templates:
+        return Response(_voice_twiml(streams, hello_url, base), status=200, mimetype="text/xml")
+
+    vr = VoiceResponse()
+    if streams:
+        try:
+            start = Start()
+            for url, track in streams:
+                start.stream(url=url, track=track)
+            vr.append(start)
+        except Exception as e:
+            log.warning("Failed to attach media streams: %s", e)
     g = Gather(
         input="speech",
         method="POST",
-        action=url_for("hello_got_speech", _external=True),
+        action=hello_url,
         timeout=str(_runtime.callee_silence_hangup_seconds),
         speech_timeout="auto",
         barge_in=False,
-        partial_result_callback=url_for("transcribe_partial", stage="hello", seq=0, _external=True),
+        partial_result_callback=f"{base}/transcribe-partial?stage=hello&seq=0",
         partial_result_callback_method="POST",
         language=_runtime.tts_language,
     )
     vr.append(g)
-    vr.redirect(url_for("hello_got_speech", _external=True), method="POST")
+    vr.redirect(hello_url, method="POST")
     return Response(str(vr), status=200, mimetype="text/xml")
 
 
+def _hello_twiml(voice: str, opening_lines: List[str]) -> str:
+    """
+    Template-based equivalent of the VoiceResponse tree built in hello_got_speech().
+    """
+    language = _runtime.tts_language
+    parts = [_TWIML_HEAD]
+    for i, line in enumerate(opening_lines):
+        parts.append(_say_twiml(line, voice, language))
+        if i < len(opening_lines) - 1 and _runtime.greeting_pause_seconds > 0:
+            parts.append(_pause_twiml(_runtime.greeting_pause_seconds))
+    base = _callback_base_url()
+    parts.append(_gather_twiml(
+        f"{base}/dialog?turn=1",
+        f"{base}/transcribe-partial?stage=dialog&seq=1",
+        barge_in=True,
+    ))
+    parts.append(_say_twiml("Goodbye.", voice, language))
+    parts.append(_TWIML_HANGUP)
+    parts.append(_TWIML_TAIL)
+    return "".join(parts)
+
+
 @app.route("/hello", methods=["POST"])
 def hello_got_speech():
-    if VoiceResponse is None:
+    if VoiceResponse is None and not _runtime.twiml_templates:
         log.error("Server missing Twilio TwiML library.")
         return Response("Server missing Twilio TwiML library.", status=500)
-    vr = VoiceResponse()
 
     call_sid = request.values.get("CallSid", "") or ""
     log.info("ENTRY /hello: CallSid=%s", _mask_sid(call_sid))
@@ -1646,20 +2072,28 @@ def hello_got_speech():
 
     params = _get_params_for_sid(call_sid)
     opening_lines = _build_opening_lines_for_sid(call_sid)
+
+    if _runtime.twiml_templates:
+        for line in opening_lines:
+            _append_transcript(call_sid, "Assistant", line, is_final=True)
+        return Response(_hello_twiml(params.voice, opening_lines), status=200, mimetype="text/xml")
+
+    vr = VoiceResponse()
     for i, line in enumerate(opening_lines):
         _append_transcript(call_sid, "Assistant", line, is_final=True)
         _say_with_prosody(vr, line, voice=params.voice, language=_runtime.tts_language)
         if i < len(opening_lines) - 1 and _runtime.greeting_pause_seconds > 0:
             vr.pause(length=_runtime.greeting_pause_seconds)
 
+    base = _callback_base_url()
     g = Gather(
         input="speech",
         method="POST",
-        action=url_for("dialog", turn=1, _external=True),
+        action=f"{base}/dialog?turn=1",
         timeout=str(_runtime.callee_silence_hangup_seconds),
         speech_timeout="auto",
         barge_in=True,
-        partial_result_callback=url_for("transcribe_partial", stage="dialog", seq=1, _external=True),
+        partial_result_callback=f"{base}/transcribe-partial?stage=dialog&seq=1",
         partial_result_callback_method="POST",
         language=_runtime.tts_language,
     )
@@ -1669,12 +2103,36 @@ def hello_got_speech():
     return Response(str(vr), status=200, mimetype="text/xml")
 
 
+def _dialog_twiml(voice: str, reply_lines: List[str], next_turn: Optional[int]) -> str:
+    """
+    Template-based equivalent of the VoiceResponse tree built in dialog().
+    """
+    language = _runtime.tts_language
+    parts = [_TWIML_HEAD]
+    if _runtime.response_pause_seconds > 0:
+        parts.append(_pause_twiml(_runtime.response_pause_seconds))
+    for i, line in enumerate(reply_lines):
+        parts.append(_say_twiml(line, voice, language))
+        if i < len(reply_lines) - 1 and _runtime.between_phrases_pause_seconds > 0:
+            parts.append(_pause_twiml(_runtime.between_phrases_pause_seconds))
+    if next_turn is not None:
+        base = _callback_base_url()
+        parts.append(_gather_twiml(
+            f"{base}/dialog?turn={next_turn}",
+            f"{base}/transcribe-partial?stage=dialog&seq={next_turn}",
+            barge_in=True,
+        ))
+    parts.append(_say_twiml("Goodbye.", voice, language))
+    parts.append(_TWIML_HANGUP)
+    parts.append(_TWIML_TAIL)
+    return "".join(parts)
+
+
 @app.route("/dialog", methods=["POST"])
 def dialog():
-    if VoiceResponse is None:
+    if VoiceResponse is None and not _runtime.twiml_templates:
         log.error("Server missing Twilio TwiML library.")
         return Response("Server missing Twilio TwiML library.", status=500)
-    vr = VoiceResponse()
 
     call_sid = request.values.get("CallSid", "") or ""
     turn = _parse_int(request.args.get("turn"), 1)
@@ -1687,6 +2145,17 @@ def dialog():
     if speech_text:
         _append_transcript(call_sid, "Callee", speech_text, is_final=True)
 
+    if _runtime.twiml_templates:
+        params = _get_params_for_sid(call_sid)
+        reply_lines = _compose_assistant_reply(call_sid, turn)
+        log.info("Assistant reply line count=%s", len(reply_lines))
+        for line in reply_lines:
+            _append_transcript(call_sid, "Assistant", line, is_final=True)
+        next_turn = turn + 1 if turn < _runtime.max_dialog_turns else None
+        return Response(_dialog_twiml(params.voice, reply_lines, next_turn), status=200, mimetype="text/xml")
+
+    vr = VoiceResponse()
+
     # Optional pause before the assistant responds (timing config)
     if _runtime.response_pause_seconds > 0:
         try:
@@ -1705,14 +2174,15 @@ def dialog():
 
     if turn < _runtime.max_dialog_turns:
         next_turn = turn + 1
+        base = _callback_base_url()
         g = Gather(
             input="speech",
             method="POST",
-            action=url_for("dialog", turn=next_turn, _external=True),
+            action=f"{base}/dialog?turn={next_turn}",
             timeout=str(_runtime.callee_silence_hangup_seconds),
             speech_timeout="auto",
             barge_in=True,
-            partial_result_callback=url_for("transcribe_partial", stage="dialog", seq=next_turn, _external=True),
+            partial_result_callback=f"{base}/transcribe-partial?stage=dialog&seq={next_turn}",
             partial_result_callback_method="POST",
             language=_runtime.tts_language,
         )
@@ -1739,9 +2209,54 @@ def transcribe_partial():
     return ("", 204)
 
 
+# Completed-call persistence runs off the webhook thread so /status returns
+# immediately; a single worker keeps history writes serialized. A SID stays
+# pending until its write finishes, so retried or duplicate completions that
+# arrive meanwhile coalesce into it (Twilio repeats the same completion data).
+# Once a SID has been written and its in-memory state released, a late retry
+# would only write an empty transcript over the stored one, so recently
+# persisted SIDs are remembered and skipped. A failed write records nothing
+# and keeps the transcript, so a retried completion can write it again.
+_PERSIST_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="persist")
+atexit.register(_PERSIST_POOL.shutdown, wait=True)
+_PERSIST_PENDING_LOCK = threading.Lock()
+_PERSIST_PENDING: "set[str]" = set()
+_PERSISTED_SIDS: "OrderedDict[str, None]" = OrderedDict()
+_PERSISTED_SIDS_MAX = 1024
+
+
+def _schedule_persist(call_sid: str) -> None:
+    with _PERSIST_PENDING_LOCK:
+        if call_sid in _PERSIST_PENDING:
+            log.debug("Persist already queued for %s; coalescing.", _mask_sid(call_sid))
+            return
+        if call_sid in _PERSISTED_SIDS:
+            log.debug("Call %s already persisted; ignoring repeat completion.", _mask_sid(call_sid))
+            return
+        _PERSIST_PENDING.add(call_sid)
+    _PERSIST_POOL.submit(_persist_and_release_call, call_sid)
+
+
+def _persist_and_release_call(call_sid: str) -> None:
+    try:
+        _persist_call_history(call_sid)
+    except Exception as e:
+        log.error("Failed to persist call history for %s: %s", _mask_sid(call_sid), e)
+        with _PERSIST_PENDING_LOCK:
+            _PERSIST_PENDING.discard(call_sid)
+        return
+    with _transcript_lock(call_sid):
+        _TRANSCRIPTS.pop(call_sid, None)
+    with _PERSIST_PENDING_LOCK:
+        _PERSIST_PENDING.discard(call_sid)
+        _PERSISTED_SIDS[call_sid] = None
+        while len(_PERSISTED_SIDS) > _PERSISTED_SIDS_MAX:
+            _PERSISTED_SIDS.popitem(last=False)
+
+
 @app.route("/status", methods=["POST"])
 def status_callback():
-    call_sid = request.values.get("CallSid", "") or ""
+    call_sid = sys.intern(request.values.get("CallSid", "") or "")
     call_status = (request.values.get("CallStatus") or "").lower()
     answered_by = request.values.get("AnsweredBy") or ""
     sip_code = request.values.get("SipResponseCode") or ""
@@ -1773,7 +2288,7 @@ def status_callback():
         _set_current_call_sid(None)
         _clear_outgoing_pending()
         dur_i = _parse_int(duration, 0)
-        with _CALL_META_LOCK:
+        with _call_meta_lock(call_sid):
             meta = _CALL_META.setdefault(call_sid, {})
             meta["completed_at"] = now
             meta["duration_seconds"] = dur_i
@@ -1781,9 +2296,7 @@ def status_callback():
             if cp:
                 meta["voice"] = cp.voice
                 meta["dialog_idx"] = cp.dialog_idx
-        _persist_call_history(call_sid)
-        with _TRANSCRIPTS_LOCK:
-            _TRANSCRIPTS.pop(call_sid, None)
+        _schedule_persist(call_sid)
         _reset_schedule_after_completion(now)
 
     return ("", 204)
@@ -1796,17 +2309,16 @@ def recording_status():
     status = (request.values.get("RecordingStatus") or "").lower()
     log.info("Recording status: call=%s rec=%s status=%s", _mask_sid(call_sid), rec_sid, status)
     if call_sid and rec_sid:
-        with _CALL_META_LOCK:
+        with _call_meta_lock(call_sid):
             meta = _CALL_META.setdefault(call_sid, {})
-            recs = meta.setdefault("recordings", [])
-            if status in ("in-progress", "completed"):
-                if not any(r.get("recording_sid") == rec_sid for r in recs):
-                    recs.append({"recording_sid": rec_sid, "status": status})
-            else:
-                for r in recs:
-                    if r.get("recording_sid") == rec_sid:
-                        r["status"] = status
-                        break
+            # Keyed by RecordingSid (insertion-ordered); persistence flattens it to a list.
+            recs = meta.setdefault("recordings", {})
+            rec = recs.get(rec_sid)
+            if rec is None:
+                if status in ("in-progress", "completed"):
+                    recs[rec_sid] = {"recording_sid": rec_sid, "status": status}
+            elif status not in ("in-progress", "completed"):
+                rec["status"] = status
     return ("", 204)
 
 
@@ -1817,27 +2329,69 @@ else:
     _sock = None
 
 _AUDIO_CLIENTS_LOCK = threading.Lock()
-_AUDIO_CLIENTS: Set[Any] = set()
+# Each browser listener gets its own bounded frame queue drained by a writer
+# thread, so a slow client only drops its own frames and never stalls the
+# Twilio media socket or the other listeners.
+_AUDIO_CLIENTS: Dict[Any, "queue.Queue[Optional[str]]"] = {}
+_AUDIO_CLIENT_QUEUE_MAX = 64  # ~1.3s of 20ms frames
+
+
+def _audio_client_writer(ws: Any, q: "queue.Queue[Optional[str]]") -> None:
+    while True:
+        payload = q.get()
+        if payload is None:
+            return
+        try:
+            ws.send(payload)
+        except Exception:
+            with _AUDIO_CLIENTS_LOCK:
+                _AUDIO_CLIENTS.pop(ws, None)
+            log.info("Cleaned up disconnected audio client.")
+            return
+
+
+_MEDIA_PAYLOAD_RE = re.compile(r'"payload"\s*:\s*"([^"\\]*)"')
+
+
+def _media_payload_fast(msg: Any) -> Optional[str]:
+    """
+    Pull the base64 payload out of a Twilio "media" frame without a full JSON
+    parse. Returns None when the frame is not an unescaped media frame, in
+    which case the caller falls back to json parsing.
+    """
+    if not isinstance(msg, str) or '"event":"media"' not in msg:
+        return None
+    m = _MEDIA_PAYLOAD_RE.search(msg)
+    return m.group(1) if m else None
 
 
 def _broadcast_audio(payload_b64: str) -> None:
     if not payload_b64:
         return
     with _AUDIO_CLIENTS_LOCK:
-        clients = list(_AUDIO_CLIENTS)
-    drop_count = 0
-    for ws in clients:
+        queues = list(_AUDIO_CLIENTS.values())
+    for q in queues:
         try:
-            ws.send(payload_b64)
-        except Exception:
-            drop_count += 1
+            q.put_nowait(payload_b64)
+        except queue.Full:
+            # Live audio: drop the oldest frame rather than fall further behind.
             try:
-                with _AUDIO_CLIENTS_LOCK:
-                    _AUDIO_CLIENTS.discard(ws)
-            except Exception:
+                q.get_nowait()
+                q.put_nowait(payload_b64)
+            except (queue.Empty, queue.Full):
                 pass
-    if drop_count:
-        log.info("Cleaned up %s disconnected audio clients.", drop_count)
+
+
+def _close_audio_client_queue(q: "queue.Queue[Optional[str]]") -> None:
+    while True:
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            break
+    try:
+        q.put_nowait(None)
+    except queue.Full:
+        pass
 
 
 if _sock is not None:
@@ -1849,14 +2403,17 @@ if _sock is not None:
                 msg = ws.receive()
                 if msg is None:
                     break
-                try:
-                    data = json.loads(msg)
-                except Exception:
-                    continue
-                if data.get("event") == "media":
+                payload = _media_payload_fast(msg)
+                if payload is None:
+                    try:
+                        data = orjson.loads(msg) if orjson is not None else json.loads(msg)
+                    except Exception:
+                        continue
+                    if data.get("event") != "media":
+                        continue
                     payload = data.get("media", {}).get("payload", "")
-                    if payload:
-                        _broadcast_audio(payload)
+                if payload:
+                    _broadcast_audio(payload)
         except Exception as e:
             log.warning("WebSocket /media-in closed with error: %s", e)
         finally:
@@ -1877,8 +2434,10 @@ if _sock is not None:
 
     @_sock.route("/client-audio")
     def client_audio(ws):  # type: ignore
+        q: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=_AUDIO_CLIENT_QUEUE_MAX)
         with _AUDIO_CLIENTS_LOCK:
-            _AUDIO_CLIENTS.add(ws)
+            _AUDIO_CLIENTS[ws] = q
+        threading.Thread(target=_audio_client_writer, args=(ws, q), name="audio-client-writer", daemon=True).start()
         log.info("WebSocket client connected: /client-audio (clients=%s)", len(_AUDIO_CLIENTS))
         try:
             while True:
@@ -1889,7 +2448,8 @@ if _sock is not None:
             log.warning("WebSocket /client-audio closed with error: %s", e)
         finally:
             with _AUDIO_CLIENTS_LOCK:
-                _AUDIO_CLIENTS.discard(ws)
+                _AUDIO_CLIENTS.pop(ws, None)
+            _close_audio_client_queue(q)
             log.info("WebSocket client disconnected: /client-audio (clients=%s)", len(_AUDIO_CLIENTS))
 
 
@@ -1933,6 +2493,7 @@ def _handle_termination(signum, frame):
     log.info("Termination signal received (%s). Stopping service.", signum)
     try:
         _stop_requested.set()
+        _dialer_wake.set()
     except Exception:
         pass
     try:
@@ -1964,7 +2525,7 @@ def api_call_now():
 
     direct = _parse_bool(os.environ.get("DIRECT_DIAL_ON_TRIGGER"), True)
 
-    if not _within_active_window(_now_local()):
+    if not _within_active_window_now():
         msg = "Outside active calling window."
         log.info("Call-now inside=%s -> %s", False, msg)
         return jsonify(ok=False, reason="outside_active_window", message=msg), 200
@@ -1987,7 +2548,7 @@ def api_call_now():
 
     if direct:
         log.info("Call-now taking direct path (DIRECT_DIAL_ON_TRIGGER=true).")
-        _log_dialer_gates("direct_call_now")
+        _log_dialer_gates("direct_call_now", now)
         ok = _place_call_now()
         log.info("Direct call-now place_call_now result=%s", ok)
         if ok:
@@ -1998,10 +2559,21 @@ def api_call_now():
 
     _mark_outgoing_pending()
     _manual_call_requested.set()
+    _dialer_wake.set()
     log.info("Call-now accepted; manual request queued.")
     return jsonify(ok=True, queued=True)
 
 
+def _conditional_json(payload: Any) -> Response:
+    """
+    jsonify() plus a content-hash ETag. Polling clients that send back a
+    matching If-None-Match get an empty 304 instead of the full body.
+    """
+    resp = jsonify(payload)
+    resp.add_etag()
+    return resp.make_conditional(request)
+
+
 # New: API endpoint the frontend expects for status display
 @app.route("/api/status", methods=["GET"])
 def api_status():
@@ -2011,34 +2583,34 @@ def api_status():
     This endpoint is polled by the frontend.
     """
     now = int(time.time())
+    # Read the destination once so the lock, counts and payload all agree even
+    # if a settings reload lands mid-request.
+    rt = _runtime
+    to_number = rt.to_number
     # seconds until next scheduled attempt and interval total
     with _next_call_epoch_s_lock:
         seconds_until_next = int(max(0, _next_call_epoch_s - now)) if _next_call_epoch_s is not None else None
         interval_total = int(_interval_total_seconds) if _interval_total_seconds is not None else None
 
-    # attempts counts for the current to_number (last hour and last day)
+    # attempts counts for the current to_number (last hour and last day), and
+    # whether the caps allow an attempt now, read in one critical section
     attempts_last_hour = 0
     attempts_last_day = 0
-    if _runtime.to_number:
-        with _attempts_lock:
-            lst = list(_dest_attempts.get(_runtime.to_number, []))
-        cutoff_h = now - 3600
-        cutoff_d = now - 24 * 3600
-        attempts_last_hour = sum(1 for t in lst if t >= cutoff_h)
-        attempts_last_day = sum(1 for t in lst if t >= cutoff_d)
-
-    # can attempt now and wait seconds if capped
     can_attempt_now = True
     wait_seconds_if_capped = 0
-    if _runtime.to_number:
-        can_attempt_now, wait_seconds_if_capped = _can_attempt(now, _runtime.to_number)
+    if to_number:
+        with _attempts_lock(to_number):
+            attempts_last_hour, attempts_last_day = _attempt_counts_locked(now, to_number)
+            can_attempt_now, wait_seconds_if_capped = _can_attempt_locked(
+                now, to_number, attempts_last_hour, attempts_last_day
+            )
 
     # whether a call is currently in progress
     call_sid = _get_current_call_sid()
     call_in_progress = bool(call_sid)
 
     # within active hours/gate
-    within_active = _within_active_window(_now_local())
+    within_active = _within_active_window_now()
 
     # last error
     last_err = None
@@ -2054,18 +2626,18 @@ def api_status():
         "interval_total_seconds": interval_total if interval_total is not None else None,
         "attempts_last_hour": attempts_last_hour,
         "attempts_last_day": attempts_last_day,
-        "hourly_max_attempts": _runtime.hourly_max_attempts,
-        "daily_max_attempts": _runtime.daily_max_attempts,
+        "hourly_max_attempts": rt.hourly_max_attempts,
+        "daily_max_attempts": rt.daily_max_attempts,
         "can_attempt_now": bool(can_attempt_now),
         "wait_seconds_if_capped": int(wait_seconds_if_capped) if wait_seconds_if_capped else 0,
-        "to_number": _runtime.to_number or "",
-        "from_number": _runtime.from_number or "",
-        "from_numbers": list(_runtime.from_numbers or []),
-        "public_base_url": _runtime.public_base_url or "",
-        "active_hours_local": _runtime.active_hours_local or "",
+        "to_number": to_number or "",
+        "from_number": rt.from_number or "",
+        "from_numbers": list(rt.from_numbers),
+        "public_base_url": rt.public_base_url or "",
+        "active_hours_local": rt.active_hours_local or "",
         "last_error": last_err,
     }
-    return jsonify(payload)
+    return _conditional_json(payload)
 
 
 # New: Live transcript and live call info endpoint the frontend polls
@@ -2077,9 +2649,12 @@ def api_live():
     """
     call_sid = _get_current_call_sid()
     in_progress = bool(call_sid)
-    with _TRANSCRIPTS_LOCK:
-        transcript = list(_TRANSCRIPTS.get(call_sid, [])) if call_sid else []
-    return jsonify({
+    if call_sid:
+        with _transcript_lock(call_sid):
+            transcript = _transcript_entries(call_sid)
+    else:
+        transcript = []
+    return _conditional_json({
         "in_progress": in_progress,
         "call_sid": call_sid or "",
         "media_streams_enabled": bool(_runtime.enable_media_streams),
@@ -2088,13 +2663,23 @@ def api_live():
 
 
 # New: History endpoints (used by history UI and to compute metrics)
+_HISTORY_PAGE_MAX = 1000
+
+
 @app.route("/api/history", methods=["GET"])
 def api_history():
+    """
+    Return call summaries newest first. Optional ?limit= (1..1000, default
+    1000) and ?offset= select a page; "total" is the overall call count.
+    """
+    limit = min(max(1, _parse_int(request.args.get("limit"), _HISTORY_PAGE_MAX)), _HISTORY_PAGE_MAX)
+    offset = max(0, _parse_int(request.args.get("offset"), 0))
     try:
-        calls = _scan_history_summaries(limit=1000)
-        return jsonify({"calls": calls})
+        calls = _scan_history_summaries(limit=limit, offset=offset)
+        total = int(_compute_history_metrics().get("total_calls") or 0)
+        return _conditional_json({"calls": calls, "total": total, "limit": limit, "offset": offset})
     except Exception:
-        return jsonify({"calls": []})
+        return jsonify({"calls": [], "total": 0, "limit": limit, "offset": offset})
 
 
 @app.route("/api/history/<sid>", methods=["GET"])
@@ -2102,7 +2687,7 @@ def api_history_get(sid: str):
     d = _load_call_history(sid)
     if not d:
         return Response("Not found", status=404)
-    return jsonify(d)
+    return _conditional_json(d)
 
 
 # New: Metrics endpoint used to drive summary graphics (total calls, total call time)
@@ -2110,7 +2695,7 @@ def api_history_get(sid: str):
 def api_metrics():
     try:
         metrics = _compute_history_metrics()
-        return jsonify(metrics)
+        return _conditional_json(metrics)
     except Exception as e:
         log.exception("Failed computing metrics: %s", e)
         return jsonify({"total_calls": 0, "total_duration_seconds": 0, "average_call_seconds": 0})
@@ -2121,6 +2706,13 @@ def health():
     return jsonify(ok=True, ts=int(time.time()))
 
 
+# Twilio sends several webhooks per call (/voice, /hello, /dialog, /status,
+# partial transcripts). Under Hypercorn idle connections are kept open this
+# long so a burst reuses one connection instead of reconnecting per event.
+# The Werkzeug dev server always answers "Connection: close".
+_KEEP_ALIVE_SECONDS = 30
+
+
 def main():
     # Initialize SQLite database
     init_database()
@@ -2148,8 +2740,8 @@ def main():
             
             config = Config()
             config.bind = [f"{host}:{port}"]
-            # Keep reasonably short timeouts for responsiveness
-            config.keep_alive_timeout = 5
+            # Hold idle connections long enough to span a call's webhook burst
+            config.keep_alive_timeout = _KEEP_ALIVE_SECONDS
             config.graceful_timeout = 10
             
             log.info("Starting Hypercorn ASGI server on %s:%s (WebSocket support enabled)", host, port)